@@ -2,8 +2,8 @@
 
 from .game import Game
 from .player import Player
-from .enemy import Enemy
-from .weapon import Weapon, Attack
+from .enemy import EnemyGroup
+from .weapon import Weapon, AttackPool
 from .music import Music
 
-__all__ = ["Game", "Player", "Enemy", "Weapon", "Attack", "Music"]
+__all__ = ["Game", "Player", "EnemyGroup", "Weapon", "AttackPool", "Music"]
@@ -0,0 +1,141 @@
+"""攻撃の状態を配列でまとめて更新する関数を定義するモジュール.
+
+Numba が利用できる場合は攻撃1つずつのループを JIT コンパイルした関数を使い、
+利用できない環境（Web 版など）では NumPy の配列演算で同じ処理を行う.
+"""
+
+from typing import Tuple
+import numpy as np
+
+try:
+    from numba import njit
+except ImportError:  # Numba が無い環境では NumPy 版を使う
+    njit = None
+
+
+# 武器の種類のコード
+KNIFE = 0
+MAGIC_BLADE = 1
+HOLY_WATER = 2
+SACRED_FLAME = 3
+
+# 聖なる炎が継続ダメージを与える間隔（フレーム、2のべき乗にしてビット演算で判定する）
+DOT_INTERVAL = 16
+DOT_MASK = DOT_INTERVAL - 1
+
+
+def _tick_attacks_loop(
+    xs: np.ndarray,
+    ys: np.ndarray,
+    dxs: np.ndarray,
+    dys: np.ndarray,
+    lifetimes: np.ndarray,
+    weapon_ids: np.ndarray,
+    spawn_frames: np.ndarray,
+    dot_hits: np.ndarray,
+    frame: int,
+    has_dot: bool,
+) -> Tuple[int, int]:
+    """持続時間が切れた攻撃を詰めながら、残りの攻撃を1つずつ更新（Numba でコンパイルして使う）.
+
+    Args:
+        xs (np.ndarray): X座標（float32）
+        ys (np.ndarray): Y座標（float32）
+        dxs (np.ndarray): X方向の移動量（float32）
+        dys (np.ndarray): Y方向の移動量（float32）
+        lifetimes (np.ndarray): 残りの持続時間（int16）
+        weapon_ids (np.ndarray): 武器の番号（int8）
+        spawn_frames (np.ndarray): 攻撃が出現したフレーム（int32、has_dot が False なら使わない）
+        dot_hits (np.ndarray): 継続ダメージのタイミングになった攻撃のインデックスを書き込む配列（攻撃の数以上の長さ）
+        frame (int): 現在のフレーム
+        has_dot (bool): 継続ダメージを持つ武器の攻撃かどうか（False なら継続ダメージの判定を行わない）
+
+    Returns:
+        Tuple[int, int]: (残った攻撃の数, dot_hits に書き込んだ数)
+    """
+    alive_count = 0
+    hit_count = 0
+    for i in range(xs.shape[0]):
+        if lifetimes[i] <= 0:
+            continue
+        # 有効な攻撃を配列の前方に詰める
+        j = alive_count
+        if j != i:
+            xs[j] = xs[i]
+            ys[j] = ys[i]
+            dxs[j] = dxs[i]
+            dys[j] = dys[i]
+            lifetimes[j] = lifetimes[i]
+            weapon_ids[j] = weapon_ids[i]
+            if has_dot:
+                spawn_frames[j] = spawn_frames[i]
+        alive_count += 1
+
+        lifetimes[j] -= 1
+        # 移動しない攻撃（聖水と聖なる炎）は移動量が0なので、種類を判定せずに足す
+        xs[j] += dxs[j]
+        ys[j] += dys[j]
+        if has_dot:
+            # 出現してから DOT_INTERVAL 回目の更新ごとに継続ダメージ
+            # 分岐せずに毎回書き込み、タイミングの時だけ書き込み位置を進める
+            dot_hits[hit_count] = j
+            hit_count += ((frame - spawn_frames[j]) & DOT_MASK) == DOT_MASK
+    return alive_count, hit_count
+
+
+def _tick_attacks_numpy(
+    xs: np.ndarray,
+    ys: np.ndarray,
+    dxs: np.ndarray,
+    dys: np.ndarray,
+    lifetimes: np.ndarray,
+    weapon_ids: np.ndarray,
+    spawn_frames: np.ndarray,
+    dot_hits: np.ndarray,
+    frame: int,
+    has_dot: bool,
+) -> Tuple[int, int]:
+    """持続時間が切れた攻撃を生存マスクで詰め、残りの攻撃をまとめて更新.
+
+    Numba が無い環境で使う. 引数と戻り値は _tick_attacks_loop と同じ.
+    """
+    n = xs.shape[0]
+    # 持続時間が切れた攻撃を取り除き、配列を詰める
+    alive = lifetimes > 0
+    survivors = int(np.count_nonzero(alive))
+    if survivors < n:
+        arrays = (
+            (xs, ys, dxs, dys, lifetimes, weapon_ids, spawn_frames) if has_dot else (xs, ys, dxs, dys, lifetimes, weapon_ids)
+        )
+        for array in arrays:
+            np.compress(alive, array, out=array[:survivors])
+        n = survivors
+
+    lifetimes[:n] -= 1
+    # 移動しない攻撃（聖水と聖なる炎）は移動量が0なので、種類を判定せずに足す
+    xs[:n] += dxs[:n]
+    ys[:n] += dys[:n]
+    if not has_dot:
+        return n, 0
+    # 出現してから DOT_INTERVAL 回目の更新ごとに継続ダメージ
+    # （条件をまとめて評価し、分岐せずにインデックスを求める）
+    hits = np.flatnonzero(((frame - spawn_frames[:n]) & DOT_MASK) == DOT_MASK)
+    dot_hits[: hits.shape[0]] = hits
+    return n, hits.shape[0]
+
+
+if njit is not None:
+    HAS_NUMBA = True
+    tick_attacks = njit(cache=True, fastmath=True)(_tick_attacks_loop)
+else:
+    HAS_NUMBA = False
+    tick_attacks = _tick_attacks_numpy
+
+
+def warmup() -> None:
+    """空の配列で tick_attacks を一度呼び、JIT コンパイルを済ませておく."""
+    f32 = np.zeros(0, dtype=np.float32)
+    i16 = np.zeros(0, dtype=np.int16)
+    i8 = np.zeros(0, dtype=np.int8)
+    i32 = np.zeros(0, dtype=np.int32)
+    tick_attacks(f32, f32, f32, f32, i16, i8, i32, np.zeros(0, dtype=np.intp), 0, False)
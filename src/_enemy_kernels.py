@@ -0,0 +1,255 @@
+"""敵の行動を配列でまとめて計算する関数を定義するモジュール.
+
+Numba が利用できる場合は敵1体ずつのループを JIT コンパイルした関数を使い、
+利用できない環境（Web 版など）では NumPy の配列演算で同じ処理を行う.
+"""
+
+import math
+from typing import Tuple
+import numpy as np
+
+try:
+    from numba import njit
+except ImportError:  # Numba が無い環境では NumPy 版を使う
+    njit = None
+
+
+# 行動パターンのコード
+CHASE = 0  # プレイヤーを追いかける
+CIRCLE = 1  # 円を描いて移動
+TELEPORT = 2  # 瞬間移動
+ZIGZAG = 3  # ジグザグ移動
+
+# 三角関数のテーブル（1周を1024分割）
+# 160x120 の画面では角度の誤差が見た目に影響しないため、sin/cos を毎回計算せず表引きする
+TRIG_TABLE_SIZE = 1024
+TRIG_TABLE_MASK = TRIG_TABLE_SIZE - 1
+TRIG_TABLE_SCALE = TRIG_TABLE_SIZE / (2 * math.pi)  # 角度（ラジアン）からテーブル位置への変換係数
+SIN_TABLE = np.sin(np.arange(TRIG_TABLE_SIZE) * (2 * math.pi / TRIG_TABLE_SIZE)).astype(np.float32)
+COS_TABLE = np.cos(np.arange(TRIG_TABLE_SIZE) * (2 * math.pi / TRIG_TABLE_SIZE)).astype(np.float32)
+
+# Python 側から1つずつ引く場合はリストの方が速い
+_SIN_LIST = SIN_TABLE.tolist()
+_COS_LIST = COS_TABLE.tolist()
+
+# テレポート先までの距離の範囲
+TELEPORT_DISTANCE_MIN = 20
+TELEPORT_DISTANCE_MAX = 40
+
+# プレイヤーからこの距離（|dx| + |dy|）より遠い敵は、行動パターンに関わらず
+# 三角関数を使わない単純な追跡で近づける（画面外なので動きの違いは見えない）
+FAR_DISTANCE = 300
+
+
+def _update_enemies_loop(
+    xs: np.ndarray,
+    ys: np.ndarray,
+    behavior: np.ndarray,
+    speed: np.ndarray,
+    circle_angle: np.ndarray,
+    circle_radius: np.ndarray,
+    circle_speed: np.ndarray,
+    teleport_timer: np.ndarray,
+    teleport_cd: np.ndarray,
+    zigzag_offset: np.ndarray,
+    zigzag_width: np.ndarray,
+    zigzag_speed: np.ndarray,
+    rand_u1: np.ndarray,
+    rand_u2: np.ndarray,
+    player_x: float,
+    player_y: float,
+) -> None:
+    """敵の移動を1体ずつ計算し、配列をその場で更新（Numba でコンパイルして使う）.
+
+    Args:
+        xs (np.ndarray): X座標（float32）
+        ys (np.ndarray): Y座標（float32）
+        behavior (np.ndarray): 行動パターンのコード（int8）
+        speed (np.ndarray): 移動速度（float32）
+        circle_angle (np.ndarray): 円移動の角度（float32）
+        circle_radius (np.ndarray): 円移動の半径（float32）
+        circle_speed (np.ndarray): 円移動の角速度（float32）
+        teleport_timer (np.ndarray): テレポートのタイマー（int32）
+        teleport_cd (np.ndarray): テレポートのクールダウン（int32）
+        zigzag_offset (np.ndarray): ジグザグの位相（float32）
+        zigzag_width (np.ndarray): ジグザグの幅（float32）
+        zigzag_speed (np.ndarray): ジグザグの速度（float32）
+        rand_u1 (np.ndarray): テレポート方向用の一様乱数（float64, 0以上1未満）
+        rand_u2 (np.ndarray): テレポート距離用の一様乱数（float64, 0以上1未満）
+        player_x (float): プレイヤーのX座標
+        player_y (float): プレイヤーのY座標
+    """
+    for i in range(xs.shape[0]):
+        # プレイヤーまでの距離と方向を計算
+        # 正規化は speed / 距離 を1回だけ割り、方向ベクトルに掛けて行う
+        dx = player_x - xs[i]
+        dy = player_y - ys[i]
+        d2 = dx * dx + dy * dy
+        b = behavior[i]
+
+        if b == CHASE or abs(dx) + abs(dy) > FAR_DISTANCE:
+            # ゾンビ（と遠くにいる敵）: プレイヤーを追いかける
+            if d2 > 0:
+                inv_speed = speed[i] / math.sqrt(d2)
+                xs[i] += dx * inv_speed
+                ys[i] += dy * inv_speed
+
+        elif b == CIRCLE:
+            # コウモリ: プレイヤーを中心に円を描いて移動
+            angle = circle_angle[i] + circle_speed[i]
+            circle_angle[i] = angle
+            k = int(angle * TRIG_TABLE_SCALE + 0.5) & TRIG_TABLE_MASK
+            target_x = player_x + COS_TABLE[k] * circle_radius[i]
+            target_y = player_y + SIN_TABLE[k] * circle_radius[i]
+            xs[i] += (target_x - xs[i]) * speed[i]
+            ys[i] += (target_y - ys[i]) * speed[i]
+
+        elif b == TELEPORT:
+            # ゴースト: 一定時間ごとに瞬間移動
+            if d2 > 0:
+                inv_half = speed[i] * 0.5 / math.sqrt(d2)
+                xs[i] += dx * inv_half
+                ys[i] += dy * inv_half
+            teleport_timer[i] += 1
+            if teleport_timer[i] >= teleport_cd[i]:
+                k = int(rand_u1[i] * TRIG_TABLE_SIZE) & TRIG_TABLE_MASK
+                teleport_distance = TELEPORT_DISTANCE_MIN + int(
+                    rand_u2[i] * (TELEPORT_DISTANCE_MAX - TELEPORT_DISTANCE_MIN + 1)
+                )
+                xs[i] = player_x + COS_TABLE[k] * teleport_distance
+                ys[i] = player_y + SIN_TABLE[k] * teleport_distance
+                teleport_timer[i] = 0
+
+        elif b == ZIGZAG:
+            # スケルトン: 進行方向に対して垂直にジグザグ移動
+            if d2 > 0:
+                inv_speed = speed[i] / math.sqrt(d2)
+                base_dx = dx * inv_speed
+                base_dy = dy * inv_speed
+                zigzag_offset[i] += zigzag_speed[i]
+                k = int(zigzag_offset[i] * TRIG_TABLE_SCALE + 0.5) & TRIG_TABLE_MASK
+                zigzag_amount = SIN_TABLE[k] * zigzag_width[i]
+                xs[i] += base_dx - base_dy * zigzag_amount
+                ys[i] += base_dy + base_dx * zigzag_amount
+
+
+def _trig_index(angle: np.ndarray) -> np.ndarray:
+    """角度の配列を三角関数テーブルの位置に変換.
+
+    Args:
+        angle (np.ndarray): 角度（ラジアン）
+
+    Returns:
+        np.ndarray: SIN_TABLE/COS_TABLE の位置
+    """
+    return (angle * TRIG_TABLE_SCALE + 0.5).astype(np.int64) & TRIG_TABLE_MASK
+
+
+def sincos(angle: float) -> Tuple[float, float]:
+    """三角関数テーブルから sin と cos をまとめて取得.
+
+    Args:
+        angle (float): 角度（ラジアン）
+
+    Returns:
+        Tuple[float, float]: (sin, cos)
+    """
+    k = int(angle * TRIG_TABLE_SCALE + 0.5) & TRIG_TABLE_MASK
+    return _SIN_LIST[k], _COS_LIST[k]
+
+
+def _update_enemies_numpy(
+    xs: np.ndarray,
+    ys: np.ndarray,
+    behavior: np.ndarray,
+    speed: np.ndarray,
+    circle_angle: np.ndarray,
+    circle_radius: np.ndarray,
+    circle_speed: np.ndarray,
+    teleport_timer: np.ndarray,
+    teleport_cd: np.ndarray,
+    zigzag_offset: np.ndarray,
+    zigzag_width: np.ndarray,
+    zigzag_speed: np.ndarray,
+    rand_u1: np.ndarray,
+    rand_u2: np.ndarray,
+    player_x: float,
+    player_y: float,
+) -> None:
+    """敵の移動を行動パターンごとのマスクで一括計算し、配列をその場で更新.
+
+    Numba が無い環境で使う. 引数は _update_enemies_loop と同じ.
+    """
+    # プレイヤーまでの距離と方向を計算
+    dx = player_x - xs
+    dy = player_y - ys
+    d2 = dx * dx + dy * dy
+    moving = d2 > 0
+    far = np.abs(dx) + np.abs(dy) > FAR_DISTANCE
+    near = ~far
+
+    # ゾンビ（と遠くにいる敵）: プレイヤーを追いかける
+    mask = ((behavior == CHASE) | far) & moving
+    if mask.any():
+        inv_speed = speed[mask] / np.sqrt(d2[mask])
+        xs[mask] += dx[mask] * inv_speed
+        ys[mask] += dy[mask] * inv_speed
+
+    # コウモリ: プレイヤーを中心に円を描いて移動
+    mask = (behavior == CIRCLE) & near
+    if mask.any():
+        angle = circle_angle[mask] + circle_speed[mask]
+        circle_angle[mask] = angle
+        k = _trig_index(angle)
+        radius = circle_radius[mask]
+        target_x = player_x + COS_TABLE[k] * radius
+        target_y = player_y + SIN_TABLE[k] * radius
+        xs[mask] += (target_x - xs[mask]) * speed[mask]
+        ys[mask] += (target_y - ys[mask]) * speed[mask]
+
+    # ゴースト: 一定時間ごとに瞬間移動
+    mask = (behavior == TELEPORT) & near
+    if mask.any():
+        chase = mask & moving
+        inv_half = speed[chase] * 0.5 / np.sqrt(d2[chase])
+        xs[chase] += dx[chase] * inv_half
+        ys[chase] += dy[chase] * inv_half
+        teleport_timer[mask] += 1
+        teleport = mask & (teleport_timer >= teleport_cd)
+        if teleport.any():
+            k = (rand_u1[teleport] * TRIG_TABLE_SIZE).astype(np.int64) & TRIG_TABLE_MASK
+            teleport_distance = TELEPORT_DISTANCE_MIN + np.floor(
+                rand_u2[teleport] * (TELEPORT_DISTANCE_MAX - TELEPORT_DISTANCE_MIN + 1)
+            )
+            xs[teleport] = player_x + COS_TABLE[k] * teleport_distance
+            ys[teleport] = player_y + SIN_TABLE[k] * teleport_distance
+            teleport_timer[teleport] = 0
+
+    # スケルトン: 進行方向に対して垂直にジグザグ移動
+    mask = (behavior == ZIGZAG) & near & moving
+    if mask.any():
+        inv_speed = speed[mask] / np.sqrt(d2[mask])
+        base_dx = dx[mask] * inv_speed
+        base_dy = dy[mask] * inv_speed
+        offset = zigzag_offset[mask] + zigzag_speed[mask]
+        zigzag_offset[mask] = offset
+        zigzag_amount = SIN_TABLE[_trig_index(offset)] * zigzag_width[mask]
+        xs[mask] += base_dx - base_dy * zigzag_amount
+        ys[mask] += base_dy + base_dx * zigzag_amount
+
+
+if njit is not None:
+    HAS_NUMBA = True
+    update_enemies = njit(cache=True, fastmath=True)(_update_enemies_loop)
+else:
+    HAS_NUMBA = False
+    update_enemies = _update_enemies_numpy
+
+
+def warmup() -> None:
+    """空の配列で update_enemies を一度呼び、JIT コンパイルを済ませておく."""
+    f32 = np.zeros(0, dtype=np.float32)
+    i8 = np.zeros(0, dtype=np.int8)
+    i32 = np.zeros(0, dtype=np.int32)
+    f64 = np.zeros(0, dtype=np.float64)
+    update_enemies(f32, f32, i8, f32, f32, f32, f32, i32, i32, f32, f32, f32, f64, f64, 0.0, 0.0)
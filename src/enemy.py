@@ -1,176 +1,352 @@
 """敵関連のクラスを定義するモジュール."""
 
 import math
-import random
+from dataclasses import dataclass
+from collections import Counter
+import numpy as np
 import pyxel
 
+from ._enemy_kernels import CHASE, CIRCLE, TELEPORT, ZIGZAG, sincos, update_enemies
 
-class Enemy:
-    """敵クラス."""
-
-    # 敵の種類ごとのステータス
-    ENEMY_STATS = {
-        "zombie": {
-            "hp": 10,
-            "speed": 0.5,
-            "exp": 1,
-            "color": 11,  # 緑色
-            "behavior": "chase",  # プレイヤーを追いかける
-        },
-        "bat": {
-            "hp": 8,
-            "speed": 1.0,
-            "exp": 2,
-            "color": 2,  # 紫色
-            "behavior": "circle",  # 円を描いて移動
-            "circle_radius": 20,  # 円の半径
-            "circle_speed": 0.1,  # 円を描く速度
-        },
-        "ghost": {
-            "hp": 15,
-            "speed": 0.3,
-            "exp": 3,
-            "color": 7,  # 白色
-            "behavior": "teleport",  # 瞬間移動
-            "teleport_cooldown": 60,  # 瞬間移動のクールダウン
-        },
-        "skeleton": {
-            "hp": 12,
-            "speed": 0.4,
-            "exp": 2,
-            "color": 6,  # 水色
-            "behavior": "zigzag",  # ジグザグ移動
-            "zigzag_width": 30,  # ジグザグの幅
-            "zigzag_speed": 0.05,  # ジグザグの速度
-        },
-    }
-
-    def __init__(self, x: int, y: int, enemy_type: str = "zombie"):
-        """敵の初期化.
+# 行動パターン名とコードの対応
+BEHAVIOR_CODES = {
+    "chase": CHASE,
+    "circle": CIRCLE,
+    "teleport": TELEPORT,
+    "zigzag": ZIGZAG,
+}
+
+
+# 敵の種類ごとのステータス
+ENEMY_STATS = {
+    "zombie": {
+        "hp": 10,
+        "speed": 0.5,
+        "exp": 1,
+        "color": 11,  # 緑色
+        "behavior": "chase",  # プレイヤーを追いかける
+    },
+    "bat": {
+        "hp": 8,
+        "speed": 1.0,
+        "exp": 2,
+        "color": 2,  # 紫色
+        "behavior": "circle",  # 円を描いて移動
+        "circle_radius": 20,  # 円の半径
+        "circle_speed": 0.1,  # 円を描く速度
+    },
+    "ghost": {
+        "hp": 15,
+        "speed": 0.3,
+        "exp": 3,
+        "color": 7,  # 白色
+        "behavior": "teleport",  # 瞬間移動
+        "teleport_cooldown": 60,  # 瞬間移動のクールダウン
+    },
+    "skeleton": {
+        "hp": 12,
+        "speed": 0.4,
+        "exp": 2,
+        "color": 6,  # 水色
+        "behavior": "zigzag",  # ジグザグ移動
+        "zigzag_width": 30,  # ジグザグの幅
+        "zigzag_speed": 0.05,  # ジグザグの速度
+    },
+}
+
+
+# コウモリの軌跡1段分の回転角（circle_speed）の sin/cos
+_BAT_TRAIL_DS = math.sin(ENEMY_STATS["bat"]["circle_speed"])
+_BAT_TRAIL_DC = math.cos(ENEMY_STATS["bat"]["circle_speed"])
+
+# 敵のスプライトを置くイメージバンク（種類のコード * 8 の位置に8x8で並べる）
+SPRITE_IMAGE = 0
+
+
+def load_sprites() -> None:
+    """敵の種類ごとの8x8スプライトをイメージバンクに描き込む.
+
+    pyxel.init の後に1回呼ぶ.
+    """
+    image = pyxel.image(SPRITE_IMAGE)
+    for proto in ENEMY_PROTOS_BY_CODE:
+        image.rect(proto.type_code * 8, 0, 8, 8, proto.color)
+
+
+# 敵の種類（配列上では ENEMY_STATS の並び順のインデックスで保持する）
+ENEMY_TYPES = tuple(ENEMY_STATS)
+ENEMY_TYPE_CODES = {enemy_type: code for code, enemy_type in enumerate(ENEMY_TYPES)}
+
+
+@dataclass(frozen=True, slots=True)
+class EnemyProto:
+    """敵の種類ごとの初期ステータス.
+
+    ENEMY_STATS の辞書を出現のたびに引かなくて済むように、モジュール読み込み時に
+    種類ごとに1つ作っておく. 行動パターンに関係しない項目は0にする.
+    """
+
+    type_code: int
+    hp: int
+    speed: float
+    exp: int
+    color: int
+    behavior: int
+    circle_radius: float = 0
+    circle_speed: float = 0
+    teleport_cooldown: int = 0
+    zigzag_width: float = 0
+    zigzag_speed: float = 0
+
+
+def _make_proto(enemy_type: str) -> EnemyProto:
+    """ENEMY_STATS から敵の種類の初期ステータスを作成.
+
+    Args:
+        enemy_type (str): 敵の種類
+
+    Returns:
+        EnemyProto: 初期ステータス
+    """
+    stats = dict(ENEMY_STATS[enemy_type])
+    stats["behavior"] = BEHAVIOR_CODES[stats["behavior"]]
+    return EnemyProto(type_code=ENEMY_TYPE_CODES[enemy_type], **stats)
+
+
+# 敵の種類ごとの初期ステータス（名前で引く辞書と、種類のコードで引くタプル）
+ENEMY_PROTOS = {enemy_type: _make_proto(enemy_type) for enemy_type in ENEMY_TYPES}
+ENEMY_PROTOS_BY_CODE = tuple(ENEMY_PROTOS[enemy_type] for enemy_type in ENEMY_TYPES)
+
+
+class EnemyGroup:
+    """敵の集団を配列（Structure of Arrays）で管理するクラス.
+
+    敵ごとにオブジェクトを更新する代わりに、配列をまとめて
+    _enemy_kernels.update_enemies に渡して更新する.
+    """
+
+    # 配列の初期容量
+    INITIAL_CAPACITY = 64
+    # 敵の当たり判定の大きさ（8x8）
+    SIZE = 8
+
+    # 配列として保持する状態（名前, 型）
+    FIELDS = (
+        ("xs", np.float32),
+        ("ys", np.float32),
+        ("types", np.int8),
+        ("hp", np.int32),
+        ("speed", np.float32),
+        ("exp", np.int32),
+        ("behavior", np.int8),
+        ("movement_timer", np.int32),
+        ("circle_angle", np.float32),
+        ("circle_radius", np.float32),
+        ("circle_speed", np.float32),
+        ("teleport_cooldown", np.int32),
+        ("teleport_timer", np.int32),
+        ("zigzag_offset", np.float32),
+        ("zigzag_width", np.float32),
+        ("zigzag_speed", np.float32),
+    )
+
+    def __init__(self, capacity: int = INITIAL_CAPACITY):
+        """敵グループの初期化.
+
+        Args:
+            capacity (int, optional): 配列の初期容量. デフォルトは64
+        """
+        # 有効な敵は各配列の先頭 count 件
+        self.count = 0
+        self.capacity = capacity
+        for name, dtype in self.FIELDS:
+            setattr(self, name, np.zeros(capacity, dtype=dtype))
+        # 種類ごとの敵の数（出現・死亡のたびに更新し、0になった種類は取り除く）
+        self.type_counts: Counter[str] = Counter()
+
+    def __len__(self) -> int:
+        """敵の数を取得."""
+        return self.count
+
+    def _grow(self) -> None:
+        """配列の容量を2倍に拡張."""
+        self.capacity *= 2
+        for name, _ in self.FIELDS:
+            setattr(self, name, np.resize(getattr(self, name), self.capacity))
+
+    def spawn(self, x: float, y: float, enemy_type: str = "zombie", circle_angle: float = 0.0) -> None:
+        """敵を追加.
 
         Args:
-            x (int): X座標
-            y (int): Y座標
+            x (float): X座標
+            y (float): Y座標
             enemy_type (str, optional): 敵の種類. デフォルトは"zombie"
+            circle_angle (float, optional): 円を描いて移動する時の開始角度. デフォルトは0
         """
-        self.x = x
-        self.y = y
-        self.type = enemy_type
-        stats = self.ENEMY_STATS[enemy_type]
-        self.hp = stats["hp"]
-        self.speed = stats["speed"]
-        self.exp = stats["exp"]
-        self.behavior = stats["behavior"]
-        self.color = stats["color"]
+        if self.count >= self.capacity:
+            self._grow()
+        i = self.count
+        proto = ENEMY_PROTOS[enemy_type]
+        self.xs[i] = x
+        self.ys[i] = y
+        self.types[i] = proto.type_code
+        self.hp[i] = proto.hp
+        self.speed[i] = proto.speed
+        self.exp[i] = proto.exp
+        self.behavior[i] = proto.behavior
         # 行動パターン用の変数
-        self.movement_timer = 0
-        if self.behavior == "circle":
-            self.circle_angle = random.random() * math.pi * 2
-            self.circle_radius = stats["circle_radius"]
-            self.circle_speed = stats["circle_speed"]
-        elif self.behavior == "teleport":
-            self.teleport_cooldown = stats["teleport_cooldown"]
-            self.teleport_timer = 0
-        elif self.behavior == "zigzag":
-            self.zigzag_offset = 0
-            self.zigzag_width = stats["zigzag_width"]
-            self.zigzag_speed = stats["zigzag_speed"]
-
-    def update(self, player_x: int, player_y: int) -> None:
-        """敵の状態を更新.
+        self.movement_timer[i] = 0
+        self.circle_angle[i] = circle_angle
+        self.circle_radius[i] = proto.circle_radius
+        self.circle_speed[i] = proto.circle_speed
+        self.teleport_cooldown[i] = proto.teleport_cooldown
+        self.teleport_timer[i] = 0
+        self.zigzag_offset[i] = 0
+        self.zigzag_width[i] = proto.zigzag_width
+        self.zigzag_speed[i] = proto.zigzag_speed
+        self.count += 1
+        self.type_counts[enemy_type] += 1
+
+    def update(self, player_x: float, player_y: float) -> None:
+        """全ての敵の状態をまとめて更新.
 
         Args:
-            player_x (int): プレイヤーのX座標
-            player_y (int): プレイヤーのY座標
+            player_x (float): プレイヤーのX座標
+            player_y (float): プレイヤーのY座標
+        """
+        n = self.count
+        if n == 0:
+            return
+        self.movement_timer[:n] += 1
+        # テレポート用の乱数はまとめて生成してから渡す
+        update_enemies(
+            self.xs[:n],
+            self.ys[:n],
+            self.behavior[:n],
+            self.speed[:n],
+            self.circle_angle[:n],
+            self.circle_radius[:n],
+            self.circle_speed[:n],
+            self.teleport_timer[:n],
+            self.teleport_cooldown[:n],
+            self.zigzag_offset[:n],
+            self.zigzag_width[:n],
+            self.zigzag_speed[:n],
+            np.random.random(n),
+            np.random.random(n),
+            float(player_x),
+            float(player_y),
+        )
+
+    def draw(self) -> None:
+        """全ての敵を描画.
+
+        配列は1回ずつ Python のリストに変換し、敵ごとの処理では通常の数値だけを扱う.
         """
-        self.movement_timer += 1
-
-        # プレイヤーまでの距離と方向を計算
-        dx = player_x - self.x
-        dy = player_y - self.y
-        distance = math.sqrt(dx * dx + dy * dy)
-
-        if self.behavior == "chase":
-            # ゾンビ: プレイヤーを追いかける
-            if distance > 0:
-                self.x += (dx / distance) * self.speed
-                self.y += (dy / distance) * self.speed
-
-        elif self.behavior == "circle":
-            # コウモリ: 円を描いて移動
-            self.circle_angle += self.circle_speed
-            # プレイヤーを中心に円を描く
-            target_x = player_x + math.cos(self.circle_angle) * self.circle_radius
-            target_y = player_y + math.sin(self.circle_angle) * self.circle_radius
-            # 目標位置に向かってゆっくり移動
-            self.x += (target_x - self.x) * self.speed
-            self.y += (target_y - self.y) * self.speed
-
-        elif self.behavior == "teleport":
-            # ゴースト: 一定時間ごとに瞬間移動
-            if distance > 0:
-                self.x += (dx / distance) * self.speed * 0.5
-                self.y += (dy / distance) * self.speed * 0.5
-            self.teleport_timer += 1
-            if self.teleport_timer >= self.teleport_cooldown:
-                # プレイヤーの近くにランダムにテレポート
-                angle = random.random() * math.pi * 2
-                teleport_distance = random.randint(20, 40)
-                self.x = player_x + math.cos(angle) * teleport_distance
-                self.y = player_y + math.sin(angle) * teleport_distance
-                self.teleport_timer = 0
-
-        elif self.behavior == "zigzag":
-            # スケルトン: ジグザグ移動
-            if distance > 0:
-                # 基本的な移動
-                base_dx = (dx / distance) * self.speed
-                base_dy = (dy / distance) * self.speed
-                # ジグザグのオフセットを更新
-                self.zigzag_offset += self.zigzag_speed
-                # 進行方向に対して垂直な方向にオフセット
-                perpendicular_x = -base_dy
-                perpendicular_y = base_dx
-                # ジグザグ移動を適用
-                zigzag_amount = math.sin(self.zigzag_offset) * self.zigzag_width
-                self.x += base_dx + perpendicular_x * zigzag_amount
-                self.y += base_dy + perpendicular_y * zigzag_amount
-
-    def take_damage(self, damage: int) -> None:
-        """ダメージを受ける.
+        n = self.count
+        if n == 0:
+            return
+        colors = [proto.color for proto in ENEMY_PROTOS_BY_CODE]
+        blt = pyxel.blt
+        rect = pyxel.rect
+        line = pyxel.line
+        ds = _BAT_TRAIL_DS
+        dc = _BAT_TRAIL_DC
+        for (
+            x,
+            y,
+            type_code,
+            behavior,
+            movement_timer,
+            teleport_timer,
+            teleport_cooldown,
+            speed,
+            circle_angle,
+            circle_speed,
+            zigzag_offset,
+        ) in zip(
+            self.xs[:n].tolist(),
+            self.ys[:n].tolist(),
+            self.types[:n].tolist(),
+            self.behavior[:n].tolist(),
+            self.movement_timer[:n].tolist(),
+            self.teleport_timer[:n].tolist(),
+            self.teleport_cooldown[:n].tolist(),
+            self.speed[:n].tolist(),
+            self.circle_angle[:n].tolist(),
+            self.circle_speed[:n].tolist(),
+            self.zigzag_offset[:n].tolist(),
+        ):
+            # 敵の種類に応じたスプライトを描画
+            blt(x, y, SPRITE_IMAGE, type_code * 8, 0, 8, 8)
+
+            # 特殊効果
+            if behavior == TELEPORT and teleport_timer >= teleport_cooldown - 10:
+                # テレポート直前は点滅
+                if movement_timer % 4 < 2:
+                    rect(x - 1, y - 1, 10, 10, 7)
+            elif behavior == CIRCLE:
+                # コウモリは軌跡を表示
+                step = speed * 4
+                color = colors[type_code]
+                # 軌跡の角度は circle_speed ずつ戻っていくので、最初の sin/cos だけ表から引き、
+                # 以降は1段分の回転（事前に計算した正確な値）を加法定理で掛けていく
+                s, c = sincos(circle_angle - circle_speed * 3)
+                for k in range(1, 4):
+                    rect(x - c * step * k, y - s * step * k, 4, 4, color)
+                    c, s = c * dc + s * ds, s * dc - c * ds
+            elif behavior == ZIGZAG:
+                # スケルトンは移動方向を示す線を表示
+                if movement_timer % 8 < 4:
+                    sin, _ = sincos(zigzag_offset)
+                    line(x + 4, y + 4, x + 4 + sin * 8, y + 4, colors[type_code])
+
+    def apply_damage(self, xs: list[float], ys: list[float], sizes: list[float], damages: list[int]) -> None:
+        """矩形ごとに、重なっている全ての敵にダメージを与える.
+
+        check_collision と同じ条件を、矩形1つにつき全ての敵に対して分岐なしで評価する.
 
         Args:
-            damage (int): 受けるダメージ量
+            xs (list[float]): 矩形のX座標
+            ys (list[float]): 矩形のY座標
+            sizes (list[float]): 矩形の大きさ（幅と高さ）
+            damages (list[int]): 矩形ごとのダメージ量
         """
-        self.hp -= damage
+        n = self.count
+        if n == 0:
+            return
+        enemy_xs = self.xs[:n]
+        enemy_ys = self.ys[:n]
+        # 敵の右端・下端は矩形ごとに変わらないので先に計算しておく
+        enemy_rights = enemy_xs + self.SIZE
+        enemy_bottoms = enemy_ys + self.SIZE
+        hp = self.hp[:n]
+        for x, y, size, damage in zip(xs, ys, sizes, damages):
+            hp[(x <= enemy_rights) & (x + size >= enemy_xs) & (y <= enemy_bottoms) & (y + size >= enemy_ys)] -= damage
 
-    def is_alive(self) -> bool:
-        """生存しているかどうかを判定.
+    def remove_dead(self) -> int:
+        """HPが0以下の敵を取り除き、配列を詰める.
 
         Returns:
-            bool: 生存している場合はTrue
+            int: 取り除いた敵の経験値の合計
         """
-        return self.hp > 0
-
-    def draw(self) -> None:
-        """敵を描画."""
-        # 敵の種類に応じた色で描画
-        pyxel.rect(self.x, self.y, 8, 8, self.color)
-
-        # 特殊効果
-        if self.behavior == "teleport" and self.teleport_timer >= self.teleport_cooldown - 10:
-            # テレポート直前は点滅
-            if self.movement_timer % 4 < 2:
-                pyxel.rect(self.x - 1, self.y - 1, 10, 10, 7)
-        elif self.behavior == "circle":
-            # コウモリは軌跡を表示
-            angle = self.circle_angle - self.circle_speed * 3
-            for i in range(3):
-                trail_x = self.x - math.cos(angle) * self.speed * 4 * (i + 1)
-                trail_y = self.y - math.sin(angle) * self.speed * 4 * (i + 1)
-                pyxel.rect(trail_x, trail_y, 4, 4, self.color)
-                angle -= self.circle_speed
-        elif self.behavior == "zigzag":
-            # スケルトンは移動方向を示す線を表示
-            if self.movement_timer % 8 < 4:
-                pyxel.line(self.x + 4, self.y + 4, self.x + 4 + math.sin(self.zigzag_offset) * 8, self.y + 4, self.color)
+        n = self.count
+        alive = self.hp[:n] > 0
+        survivors = int(np.count_nonzero(alive))
+        if survivors == n:
+            return 0
+        dead = ~alive
+        dead_exp = int(self.exp[:n].sum(where=dead))
+        # 死亡した敵の数を種類ごとに差し引く
+        dead_counts = np.bincount(self.types[:n][dead], minlength=len(ENEMY_TYPES))
+        type_counts = self.type_counts
+        for code in np.flatnonzero(dead_counts):
+            enemy_type = ENEMY_TYPES[code]
+            type_counts[enemy_type] -= int(dead_counts[code])
+            if type_counts[enemy_type] <= 0:
+                del type_counts[enemy_type]
+        for name, _ in self.FIELDS:
+            array = getattr(self, name)
+            array[:survivors] = np.compress(alive, array[:n])
+        self.count = survivors
+        return dead_exp
@@ -1,11 +1,14 @@
 """ゲーム関連のクラスを定義するモジュール."""
 
+import math
 import random
 from typing import List, Optional
+import numpy as np
 import pyxel
 
 from .player import Player
-from .enemy import Enemy
+from .enemy import EnemyGroup, load_sprites
+from . import _attack_kernels, _enemy_kernels
 from .music import Music
 
 
@@ -48,8 +51,10 @@ class BaseGame:
         self.height = height
         # プレイヤーを画面中央に配置
         self.player = Player(width // 2, height // 2)
-        # 敵リストの初期化
-        self.enemies: List[Enemy] = []
+        # 敵の初期化（状態は配列でまとめて管理）
+        self.enemies = EnemyGroup()
+        # 敵の出現位置と種類を決める乱数生成器
+        self._rng = random.Random()
         # 敵の出現タイマー
         self.enemy_spawn_timer = 0
         self.enemy_spawn_interval = self.DIFFICULTY_SCALING["spawn_rate"]["initial"]
@@ -92,11 +97,10 @@ class BaseGame:
         options = []
         # ナイフの強化は常に選択肢に入れる
         options.append("knife_level_up")
-        # 聖水を持っていない場合は追加を選択肢に入れる
-        if not any(w.type == "holy_water" for w in self.player.weapons):
+        # 聖水を持っていない場合は追加を、持っている場合は強化を選択肢に入れる
+        if "holy_water" not in self.player.weapon_types:
             options.append("holy_water_add")
-        # 聖水を持っている場合は強化を選択肢に入れる
-        elif any(w.type == "holy_water" for w in self.player.weapons):
+        else:
             options.append("holy_water_level_up")
         # HPが最大値未満なら回復を選択肢に入れる
         if self.player.hp < 200:
@@ -148,23 +152,24 @@ class BaseGame:
 
     def spawn_enemy(self) -> None:
         """敵をランダムな位置に出現させる."""
+        rng = self._rng
         # 画面外のランダムな位置を選択
-        side = random.randint(0, 3)  # 0: 上, 1: 右, 2: 下, 3: 左
+        side = rng.getrandbits(2)  # 0: 上, 1: 右, 2: 下, 3: 左
         if side == 0:  # 上
-            x = random.randint(0, self.width - 8)
+            x = rng.randrange(self.width - 7)
             y = -8
         elif side == 1:  # 右
             x = self.width
-            y = random.randint(0, self.height - 8)
+            y = rng.randrange(self.height - 7)
         elif side == 2:  # 下
-            x = random.randint(0, self.width - 8)
+            x = rng.randrange(self.width - 7)
             y = self.height
         else:  # 左
             x = -8
-            y = random.randint(0, self.height - 8)
+            y = rng.randrange(self.height - 7)
 
         # ランダムな敵の種類を選択
-        r = random.random()
+        r = rng.random()
         if r < 0.5:  # 50%
             enemy_type = "zombie"
         elif r < 0.7:  # 20%
@@ -173,7 +178,34 @@ class BaseGame:
             enemy_type = "skeleton"
         else:  # 15%
             enemy_type = "ghost"
-        self.enemies.append(Enemy(x, y, enemy_type))
+        self.enemies.spawn(x, y, enemy_type, rng.random() * math.pi * 2)
+
+    def apply_attacks(self) -> None:
+        """プレイヤーの攻撃と重なっている敵にダメージを与える.
+
+        攻撃ごとに全ての敵との重なりをまとめて判定し、継続ダメージのタイミングになった攻撃は
+        範囲内の敵に継続ダメージも与える.
+        """
+        enemies = self.enemies
+        weapons = self.player.weapons
+        for attacks in self.player.attack_pools:
+            m = attacks.count
+            if not m:
+                continue
+            attack_xs = attacks.xs[:m].tolist()
+            attack_ys = attacks.ys[:m].tolist()
+            attack_weapons = [weapons[weapon_id] for weapon_id in attacks.weapon_ids[:m].tolist()]
+            ranges = [weapon.range for weapon in attack_weapons]
+            enemies.apply_damage(attack_xs, attack_ys, ranges, [weapon.damage for weapon in attack_weapons])
+            # 継続ダメージのタイミングになった攻撃
+            dot_hits = attacks.dot_hits[: attacks.dot_hit_count].tolist()
+            if dot_hits:
+                enemies.apply_damage(
+                    [attack_xs[i] for i in dot_hits],
+                    [attack_ys[i] for i in dot_hits],
+                    [ranges[i] for i in dot_hits],
+                    [attack_weapons[i].dot_damage for i in dot_hits],
+                )
 
     def update(self) -> None:
         """ゲームの状態を更新."""
@@ -187,7 +219,7 @@ class BaseGame:
             self.music.update_music(
                 player_speed=self.player.speed,
                 enemy_count=len(self.enemies),
-                enemy_types=[enemy.type for enemy in self.enemies],
+                enemy_type_counts=self.enemies.type_counts,
                 elapsed_minutes=self.elapsed_minutes,
             )
 
@@ -204,6 +236,13 @@ class Game(BaseGame):
         # Pyxelの初期化（画面サイズ: 160x120）
         pyxel.init(160, 120, title="Beat Survivor")
         super().__init__(pyxel.width, pyxel.height)
+        # 敵と攻撃の更新処理を事前にコンパイルし、最初のフレームでの停止を防ぐ
+        _enemy_kernels.warmup()
+        _attack_kernels.warmup()
+        # 敵のスプライトを用意
+        load_sprites()
+        # レベルアップ選択肢の表示位置（中央揃え）
+        self.level_up_text_x = {option: self.width // 2 - len(text) * 2 for option, text in self.LEVEL_UP_OPTIONS.items()}
 
     def run(self) -> None:
         """ゲームを実行."""
@@ -230,7 +269,7 @@ class Game(BaseGame):
             return
 
         # プレイヤーの更新
-        self.player.update()
+        self.player.update(self.elapsed_frames)
 
         # 敵の出現（30フレームごとに1体）
         self.enemy_spawn_timer += 1
@@ -238,30 +277,36 @@ class Game(BaseGame):
             self.spawn_enemy()
             self.enemy_spawn_timer = 0
 
-        # 敵の更新と衝突判定
-        for enemy in self.enemies:
-            enemy.update(self.player.x, self.player.y)
+        # 敵の処理で繰り返し参照する値はローカル変数に取り出しておく
+        player = self.player
+        enemies = self.enemies
+        px = player.x
+        py = player.y
 
-            # プレイヤーとの衝突判定
-            if self.check_collision(self.player.x, self.player.y, 8, 8, enemy.x, enemy.y, 8, 8):
-                self.player.hp -= 1
+        # 敵の更新（全ての敵をまとめて移動）
+        enemies.update(px, py)
+
+        # プレイヤーとの衝突判定（check_collision と同じ条件を全ての敵に対して分岐なしで評価）
+        n = len(enemies)
+        if n:
+            xs = enemies.xs[:n]
+            ys = enemies.ys[:n]
+            touching = (px <= xs + 8) & (px + 8 >= xs) & (py <= ys + 8) & (py + 8 >= ys)
+            player.hp -= int(np.count_nonzero(touching))
 
         # 攻撃と敵の衝突判定
-        for attack in self.player.attacks:
-            for enemy in self.enemies:
-                if self.check_collision(attack.x, attack.y, attack.weapon.range, attack.weapon.range, enemy.x, enemy.y, 8, 8):
-                    enemy.take_damage(attack.weapon.damage)
-
-        # 死亡した敵の処理
-        for enemy in self.enemies[:]:
-            if not enemy.is_alive():
-                self.enemies.remove(enemy)
-                self.score += enemy.exp
-                # 経験値獲得とレベルアップ判定
-                if self.player.gain_exp(enemy.exp):
-                    # レベルアップ時の選択肢を設定
-                    self.level_up_options = self.get_level_up_options()
-                    self.selected_option = 0
+        if n:
+            self.apply_attacks()
+
+        # 死亡した敵の処理（生き残った敵だけに配列を詰める）
+        dead_exp = enemies.remove_dead()
+        if dead_exp > 0:
+            self.score += dead_exp
+            # このフレームで倒した敵の経験値をまとめて獲得し、レベルアップ判定は1回だけ行う
+            if player.gain_exp(dead_exp):
+                # レベルアップ時の選択肢を設定
+                self.level_up_options = self.get_level_up_options()
+                self.selected_option = 0
 
         # 基底クラスの更新処理
         super().update()
@@ -275,8 +320,7 @@ class Game(BaseGame):
         self.player.draw()
 
         # 敵の描画
-        for enemy in self.enemies:
-            enemy.draw()
+        self.enemies.draw()
 
         # レベルアップ選択中の場合
         if self.level_up_options is not None:
@@ -285,10 +329,8 @@ class Game(BaseGame):
             # 選択肢の表示
             for i, option in enumerate(self.level_up_options):
                 color = 7 if i == self.selected_option else 13
-                text = self.LEVEL_UP_OPTIONS[option]
-                x = pyxel.width // 2 - len(text) * 2
                 y = pyxel.height // 2 - len(self.level_up_options) * 4 + i * 8
-                pyxel.text(x, y, text, color)
+                pyxel.text(self.level_up_text_x[option], y, self.LEVEL_UP_OPTIONS[option], color)
 
         # デバッグ情報の表示
         pyxel.text(4, 4, f"HP: {self.player.hp}", 7)
@@ -1,6 +1,6 @@
 """音楽生成関連のクラスを定義するモジュール."""
 
-from typing import List, Set
+from typing import FrozenSet, Mapping, Optional, Set, Tuple
 import pyxel
 
 
@@ -11,6 +11,9 @@ class Music:
         """音楽システムの初期化."""
         self.base_bpm = 120  # 基本テンポ
         self.current_bpm = self.base_bpm
+        # 1拍あたりのフレーム数（テンポが変わった時だけ再計算）
+        self._beat_frames = 30 * 60 / self.current_bpm
+        self._beat_frames_half = self._beat_frames / 2
         self.base_volume = 7  # 基本音量（0-7）
 
         # メロディとリズムのパターン定義
@@ -40,6 +43,8 @@ class Music:
         self.current_melody = "normal"
         self.current_rhythm = "normal"
         self.active_instruments: Set[int] = set()
+        # 前回パターンを選んだ時の入力（変化が無ければ選び直さない）
+        self._last_key: Optional[Tuple[float, int, FrozenSet[str]]] = None
 
         # 音楽更新用タイマー
         self.melody_timer = 0
@@ -68,44 +73,57 @@ class Music:
         pyxel.sounds[9].set("g2b2d3g3", "s", "3", "f", 40)  # 環境音（中音）
         pyxel.sounds[10].set("c3e3g3c4", "s", "3", "f", 40)  # 環境音（高音）
 
-    def update_music(self, player_speed: float, enemy_count: int, enemy_types: List[str], elapsed_minutes: int) -> None:
+    def update_music(
+        self, player_speed: float, enemy_count: int, enemy_type_counts: Mapping[str, int], elapsed_minutes: int
+    ) -> None:
         """音楽の状態を更新.
 
         Args:
             player_speed (float): プレイヤーの移動速度
             enemy_count (int): 画面上の敵の数
-            enemy_types (List[str]): 画面上の敵の種類リスト
+            enemy_type_counts (Mapping[str, int]): 画面上の敵の種類ごとの数
             elapsed_minutes (int): 経過時間（分）
         """
-        # テンポの更新（プレイヤーの速度に応じて、より大きな変化）
-        speed_factor = player_speed / 2.0  # 基準速度で割る
-        self.current_bpm = int(self.base_bpm * (1.0 + speed_factor * 0.5))  # 最大50%増加
-
-        # リズムパターンの更新（敵の数に応じて、より細かい段階）
-        if enemy_count > 30:
-            self.current_rhythm = "boss"  # 大量の敵
-        elif enemy_count > 15:
-            self.current_rhythm = "intense"  # 中程度の敵
-        else:
-            self.current_rhythm = "normal"  # 少数の敵
-
-        # メロディの選択（敵の種類に応じて）
-        if "ghost" in enemy_types:
-            self.current_melody = "holy_water"  # 幽霊には聖水のメロディ
-        elif "skeleton" in enemy_types:
-            self.current_melody = "sacred_flame"  # スケルトンには聖なる炎のメロディ
-        elif "bat" in enemy_types:
-            self.current_melody = "magic_blade"  # コウモリには魔法の剣のメロディ
-        elif "zombie" in enemy_types:
-            self.current_melody = "knife"  # ゾンビにはナイフのメロディ
-        else:
-            self.current_melody = "normal"  # 通常のメロディ
-
-        # 楽器の更新（敵の種類に応じて）
-        self.active_instruments = set()
-        for enemy_type in enemy_types:
-            if enemy_type in self.instruments:
-                self.active_instruments.add(self.instruments[enemy_type])
+        # 敵の数はリズムが切り替わる段階に丸める
+        enemy_count_level = 0 if enemy_count <= 15 else 1 if enemy_count <= 30 else 2
+        # 前のフレームと入力が変わっていなければパターンの選び直しを省く
+        key = (player_speed, enemy_count_level, frozenset(enemy_type_counts))
+        if key != self._last_key:
+            self._last_key = key
+
+            # テンポの更新（プレイヤーの速度に応じて、より大きな変化）
+            speed_factor = player_speed / 2.0  # 基準速度で割る
+            bpm = int(self.base_bpm * (1.0 + speed_factor * 0.5))  # 最大50%増加
+            if bpm != self.current_bpm:
+                self.current_bpm = bpm
+                self._beat_frames = 30 * 60 / bpm
+                self._beat_frames_half = self._beat_frames / 2
+
+            # リズムパターンの更新（敵の数に応じて、より細かい段階）
+            if enemy_count_level == 2:
+                self.current_rhythm = "boss"  # 大量の敵
+            elif enemy_count_level == 1:
+                self.current_rhythm = "intense"  # 中程度の敵
+            else:
+                self.current_rhythm = "normal"  # 少数の敵
+
+            # メロディの選択（敵の種類に応じて）
+            if enemy_type_counts.get("ghost", 0):
+                self.current_melody = "holy_water"  # 幽霊には聖水のメロディ
+            elif enemy_type_counts.get("skeleton", 0):
+                self.current_melody = "sacred_flame"  # スケルトンには聖なる炎のメロディ
+            elif enemy_type_counts.get("bat", 0):
+                self.current_melody = "magic_blade"  # コウモリには魔法の剣のメロディ
+            elif enemy_type_counts.get("zombie", 0):
+                self.current_melody = "knife"  # ゾンビにはナイフのメロディ
+            else:
+                self.current_melody = "normal"  # 通常のメロディ
+
+            # 楽器の更新（敵の種類に応じて）
+            self.active_instruments = set()
+            for enemy_type, count in enemy_type_counts.items():
+                if count and enemy_type in self.instruments:
+                    self.active_instruments.add(self.instruments[enemy_type])
 
         # 時間経過による変化（アンビエント音の追加）
         if elapsed_minutes > 0 and self.melody_timer % (60 * 2) == 0:  # 2秒ごと
@@ -117,12 +135,9 @@ class Music:
 
     def play_music(self) -> None:
         """音楽を再生."""
-        # フレーム数から音符のタイミングを計算
-        beat_frames = 30 * 60 / self.current_bpm  # 1拍あたりのフレーム数
-
         # メロディの再生
         self.melody_timer += 1
-        if self.melody_timer >= beat_frames:
+        if self.melody_timer >= self._beat_frames:
             self.melody_timer = 0
             # メロディパターンから音符を取得して再生
             note = self.melody_patterns[self.current_melody][self.note_index]
@@ -131,7 +146,7 @@ class Music:
 
         # リズムの再生（より複雑なパターン）
         self.rhythm_timer += 1
-        if self.rhythm_timer >= beat_frames / 2:  # リズムは2倍の速さ
+        if self.rhythm_timer >= self._beat_frames_half:  # リズムは2倍の速さ
             self.rhythm_timer = 0
             # アクティブな楽器ごとにリズムパターンを再生
             for instrument in self.active_instruments:
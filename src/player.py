@@ -2,13 +2,15 @@
 
 import math
 import pyxel
-from typing import Dict, List
-from .weapon import Weapon, Attack
+from typing import Dict, Set
+from .weapon import WEAPON_TYPE_CODES, Weapon, AttackPool, draw_all
 
 
 class PassiveSkill:
     """パッシブスキルクラス."""
 
+    __slots__ = ("type", "level", "bonus")
+
     def __init__(self, skill_type: str):
         """パッシブスキルの初期化.
 
@@ -37,6 +39,27 @@ class PassiveSkill:
 class Player:
     """プレイヤークラス."""
 
+    __slots__ = (
+        "x",
+        "y",
+        "hp",
+        "max_hp",
+        "base_speed",
+        "exp",
+        "level",
+        "exp_to_next_level",
+        "weapons",
+        "weapon_types",
+        "attack_pools",
+        "direction",
+        "last_move_x",
+        "last_move_y",
+        "passive_skills",
+        "speed_cached",
+        "attack_speed_mult",
+        "hp_regen_per_frame",
+    )
+
     def __init__(self, x: int, y: int):
         """プレイヤーの初期化.
 
@@ -54,21 +77,42 @@ class Player:
         self.exp_to_next_level = 10
         # 武器の初期化
         self.weapons = [Weapon("knife")]
-        self.attacks: List[Attack] = []
+        # 所持している武器の種類（武器の追加時に更新）
+        self.weapon_types: Set[str] = {"knife"}
+        # 攻撃は武器の種類のコードごとに別のプールで管理する（種類ごとの処理で分岐しなくて済む）
+        # WEAPON_TYPE_CODES はコードの順に並んでいるので、タプルの位置がそのままコードになる
+        self.attack_pools = tuple(
+            AttackPool(self.weapons, has_dot=weapon_type in Weapon.DOT_DAMAGE) for weapon_type in WEAPON_TYPE_CODES
+        )
         # 向きの初期化（右向き）
         self.direction = (1.0, 0.0)
         self.last_move_x = 0
         self.last_move_y = 0
         # パッシブスキルの初期化
         self.passive_skills: Dict[str, PassiveSkill] = {}
+        # スキルやレベルから決まるステータス（変化した時だけ再計算する）
+        self.speed_cached = 0.0
+        self.attack_speed_mult = 1.0
+        self.hp_regen_per_frame = 0.0
+        self.update_stats()
 
     @property
     def speed(self) -> float:
         """現在の移動速度を取得."""
+        return self.speed_cached
+
+    def update_stats(self) -> None:
+        """パッシブスキルとレベルから決まるステータスを再計算."""
+        skills = self.passive_skills
+        # 移動速度（最大速度は4.0）
         speed = self.base_speed
-        if "speed_up" in self.passive_skills:
-            speed += self.passive_skills["speed_up"].bonus
-        return min(speed, 4.0)  # 最大速度は4.0
+        if "speed_up" in skills:
+            speed += skills["speed_up"].bonus
+        self.speed_cached = min(speed, 4.0)
+        # 攻撃のクールダウンに掛ける倍率
+        self.attack_speed_mult = 1.0 - skills["attack_speed"].bonus if "attack_speed" in skills else 1.0
+        # 1フレームごとのHP回復量
+        self.hp_regen_per_frame = skills["hp_regen"].bonus if "hp_regen" in skills else 0.0
 
     def add_passive_skill(self, skill_type: str) -> None:
         """パッシブスキルを追加.
@@ -80,6 +124,7 @@ class Player:
             self.passive_skills[skill_type] = PassiveSkill(skill_type)
         else:
             self.passive_skills[skill_type].level_up()
+        self.update_stats()
 
     def gain_exp(self, amount: int) -> bool:
         """経験値を獲得.
@@ -104,6 +149,7 @@ class Player:
         # ステータス強化
         self.hp = min(200, self.hp + 10)
         self.base_speed = min(4, self.base_speed + 0.2)
+        self.update_stats()
 
     def add_weapon(self, weapon_type: str) -> None:
         """武器を追加.
@@ -112,61 +158,43 @@ class Player:
             weapon_type (str): 追加する武器の種類
         """
         self.weapons.append(Weapon(weapon_type))
+        self.weapon_types.add(weapon_type)
 
-    def update_direction(self) -> None:
-        """プレイヤーの向きを更新."""
-        # 移動入力から向きを計算
-        dx = 0
-        dy = 0
-        if pyxel.btn(pyxel.KEY_LEFT):
-            dx -= 1
-        if pyxel.btn(pyxel.KEY_RIGHT):
-            dx += 1
-        if pyxel.btn(pyxel.KEY_UP):
-            dy -= 1
-        if pyxel.btn(pyxel.KEY_DOWN):
-            dy += 1
-
-        # 移動入力があった場合のみ向きを更新
-        if dx != 0 or dy != 0:
+    def update(self, frame: int) -> None:
+        """プレイヤーの状態を更新.
+
+        Args:
+            frame (int): 現在のフレーム
+        """
+        # 移動処理と向きの更新（キー入力は1回だけ読み取る）
+        dx = pyxel.btn(pyxel.KEY_RIGHT) - pyxel.btn(pyxel.KEY_LEFT)
+        dy = pyxel.btn(pyxel.KEY_DOWN) - pyxel.btn(pyxel.KEY_UP)
+        # 移動入力があった場合のみ向きを更新して移動
+        if dx or dy:
             # ベクトルを正規化
-            length = math.sqrt(dx * dx + dy * dy)
-            self.direction = (dx / length, dy / length)
+            inv_length = 1.0 / math.sqrt(dx * dx + dy * dy)
+            self.direction = (dx * inv_length, dy * inv_length)
             self.last_move_x = dx
             self.last_move_y = dy
-
-    def update(self) -> None:
-        """プレイヤーの状態を更新."""
-        # 移動処理と向きの更新
-        self.update_direction()
-        # キー入力に応じて移動
-        if pyxel.btn(pyxel.KEY_LEFT):
-            self.x = max(0, self.x - self.speed)
-        if pyxel.btn(pyxel.KEY_RIGHT):
-            self.x = min(pyxel.width - 8, self.x + self.speed)
-        if pyxel.btn(pyxel.KEY_UP):
-            self.y = max(0, self.y - self.speed)
-        if pyxel.btn(pyxel.KEY_DOWN):
-            self.y = min(pyxel.height - 8, self.y + self.speed)
+            # 画面内に収まるように移動
+            speed = self.speed_cached
+            self.x = min(max(0, self.x + dx * speed), pyxel.width - 8)
+            self.y = min(max(0, self.y + dy * speed), pyxel.height - 8)
 
         # HP自然回復
-        if "hp_regen" in self.passive_skills:
-            self.hp = min(self.max_hp, self.hp + self.passive_skills["hp_regen"].bonus)
-
-        # 武器の更新と攻撃
-        for weapon in self.weapons:
-            weapon.update()
-            if weapon.can_attack():
-                cooldown_reduction = 1.0
-                if "attack_speed" in self.passive_skills:
-                    cooldown_reduction = 1.0 - self.passive_skills["attack_speed"].bonus
-                self.attacks.append(Attack(self.x, self.y, weapon, self.direction))
-                weapon.cooldown = int(weapon.max_cooldown * cooldown_reduction)
-
-        # 攻撃の更新
-        self.attacks = [attack for attack in self.attacks if attack.is_alive()]
-        for attack in self.attacks:
-            attack.update()
+        if self.hp_regen_per_frame:
+            self.hp = min(self.max_hp, self.hp + self.hp_regen_per_frame)
+
+        # 攻撃（クールダウンが明けるフレームになった武器だけが攻撃する）
+        for weapon_id, weapon in enumerate(self.weapons):
+            if weapon.can_attack(frame):
+                self.attack_pools[weapon.type_id].spawn(self.x, self.y, weapon_id, self.direction, frame)
+                weapon.next_attack_frame = frame + int(weapon.max_cooldown * self.attack_speed_mult)
+
+        # 攻撃の更新（武器の種類ごとにまとめて更新）
+        for attacks in self.attack_pools:
+            if attacks.count:
+                attacks.update(frame)
 
     def draw(self) -> None:
         """プレイヤーを描画."""
@@ -176,6 +204,5 @@ class Player:
         end_x = self.x + 4 + self.direction[0] * 8
         end_y = self.y + 4 + self.direction[1] * 8
         pyxel.line(self.x + 4, self.y + 4, end_x, end_y, 8)
-        # 攻撃の描画
-        for attack in self.attacks:
-            attack.draw()
+        # 攻撃の描画（武器の種類ごとにまとめて描画）
+        draw_all(self.attack_pools)
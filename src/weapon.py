@@ -1,7 +1,18 @@
 """武器関連のクラスを定義するモジュール."""
 
+import numpy as np
 import pyxel
-from typing import Tuple
+from typing import Dict, List, Sequence, Tuple
+
+from ._attack_kernels import HOLY_WATER, KNIFE, MAGIC_BLADE, SACRED_FLAME, tick_attacks
+
+# 武器の種類とコードの対応
+WEAPON_TYPE_CODES = {
+    "knife": KNIFE,
+    "magic_blade": MAGIC_BLADE,
+    "holy_water": HOLY_WATER,
+    "sacred_flame": SACRED_FLAME,
+}
 
 
 class Weapon:
@@ -21,6 +32,39 @@ class Weapon:
         },
     }
 
+    # 進化可能な武器の種類
+    _EVOLVABLE = frozenset(EVOLUTION_MAP)
+
+    # 武器の種類ごとのステータスの係数
+    # (基本ダメージ, レベルごとのダメージ増加, 基本範囲, レベルごとの範囲増加, 最短クールダウン, レベルごとのクールダウン短縮)
+    STATS_TABLE = {
+        "knife": (5, 2, 12, 2, 10, 2),
+        "magic_blade": (15, 3, 24, 3, 8, 2),
+        "holy_water": (10, 3, 16, 2, 15, 1),
+        "sacred_flame": (20, 4, 24, 2, 12, 1),
+    }
+
+    # 継続ダメージを持つ武器のダメージ量
+    DOT_DAMAGE = {"sacred_flame": 5}
+
+    # (種類, レベル) ごとに計算したステータス (ダメージ, 範囲, クールダウン, 継続ダメージ)
+    _stats_cache: Dict[Tuple[str, int], Tuple[int, int, int, int]] = {}
+
+    __slots__ = (
+        "type",
+        "type_id",
+        "level",
+        "next_attack_frame",
+        "max_cooldown",
+        "can_evolve",
+        "damage",
+        "range",
+        "dot_damage",
+        "draw_radius",
+        "draw_inner_radius",
+        "blink_radius",
+    )
+
     def __init__(self, weapon_type: str = "knife"):
         """武器の初期化.
 
@@ -28,134 +72,271 @@ class Weapon:
             weapon_type (str, optional): 武器の種類. デフォルトは"knife"
         """
         self.type = weapon_type
+        # 毎フレームの処理では文字列の代わりに種類のコードで判定する
+        self.type_id = WEAPON_TYPE_CODES[weapon_type]
         self.level = 1
-        self.cooldown = 0
+        self.next_attack_frame = 0  # 次に攻撃できるフレーム
         self.max_cooldown = 30  # 30フレームごとに攻撃
-        self.can_evolve = weapon_type in self.EVOLUTION_MAP
+        self.can_evolve = weapon_type in Weapon._EVOLVABLE
         self.update_stats()
 
     def update_stats(self) -> None:
         """武器のステータスを更新."""
-        # 武器の種類とレベルに応じてステータスを設定
-        if self.type == "knife":
-            self.damage = 5 + (self.level - 1) * 2
-            self.range = 12 + (self.level - 1) * 2
-            self.max_cooldown = max(10, 30 - (self.level - 1) * 2)
-        elif self.type == "magic_blade":
-            self.damage = 15 + (self.level - 1) * 3
-            self.range = 24 + (self.level - 1) * 3
-            self.max_cooldown = max(8, 30 - (self.level - 1) * 2)
-        elif self.type == "holy_water":
-            self.damage = 10 + (self.level - 1) * 3
-            self.range = 16 + (self.level - 1) * 2
-            self.max_cooldown = max(15, 30 - (self.level - 1) * 1)
-        else:  # sacred_flame
-            self.damage = 20 + (self.level - 1) * 4
-            self.range = 24 + (self.level - 1) * 2
-            self.max_cooldown = max(12, 30 - (self.level - 1) * 1)
-            self.dot_damage = 5  # 継続ダメージ
+        key = (self.type, self.level)
+        stats = self._stats_cache.get(key)
+        if stats is None:
+            # 武器の種類ごとの係数を表から引き、レベルに応じてステータスを計算
+            coefficients = self.STATS_TABLE[self.type]
+            base_damage, damage_per_level, base_range, range_per_level, min_cooldown, cooldown_step = coefficients
+            level = self.level - 1
+            stats = (
+                base_damage + level * damage_per_level,
+                base_range + level * range_per_level,
+                max(min_cooldown, 30 - level * cooldown_step),
+                self.DOT_DAMAGE.get(self.type, 0),
+            )
+            self._stats_cache[key] = stats
+        self.damage, self.range, self.max_cooldown, self.dot_damage = stats
+        # 描画に使う円の半径（範囲が変わる時だけ計算する）
+        self.draw_radius = self.range // 2
+        self.draw_inner_radius = self.draw_radius * 2 // 3
+        self.blink_radius = max(1, self.draw_radius - 2)  # 点滅する円は外側の円の少し内側
 
     def level_up(self) -> None:
         """武器をレベルアップ."""
         self.level += 1
         self.update_stats()
 
-    def update(self) -> None:
-        """武器の状態を更新."""
-        if self.cooldown > 0:
-            self.cooldown -= 1
-
-    def can_attack(self) -> bool:
+    def can_attack(self, frame: int) -> bool:
         """攻撃可能かどうかを判定.
 
+        Args:
+            frame (int): 現在のフレーム
+
         Returns:
             bool: 攻撃可能な場合はTrue
         """
-        return self.cooldown <= 0
+        return frame >= self.next_attack_frame
+
+
+# 武器の種類ごとの攻撃の持続時間（フレーム）と移動速度
+_ATTACK_TEMPLATES = {
+    "knife": (30, 2.0),
+    "magic_blade": (45, 3.0),  # 持続時間が長く、移動速度が速い
+    "holy_water": (30, 0.0),  # その場に留まる
+    "sacred_flame": (90, 0.0),  # 長時間持続
+}
+
+
+class AttackPool:
+    """攻撃をまとめて配列（Structure of Arrays）で管理するクラス.
+
+    攻撃ごとにオブジェクトを更新する代わりに、配列をまとめて
+    _attack_kernels.tick_attacks に渡して更新する.
+    """
+
+    # 配列の初期容量
+    INITIAL_CAPACITY = 32
+
+    # 配列として保持する状態（名前, 型）
+    FIELDS = (
+        ("xs", np.float32),
+        ("ys", np.float32),
+        ("dxs", np.float32),
+        ("dys", np.float32),
+        ("lifetimes", np.int16),
+        ("weapon_ids", np.int8),
+        ("spawn_frames", np.int32),
+    )
+
+    def __init__(self, weapons: List[Weapon], has_dot: bool = False, capacity: int = INITIAL_CAPACITY):
+        """攻撃プールの初期化.
+
+        Args:
+            weapons (List[Weapon]): 攻撃に使う武器のリスト（weapon_ids はこのリストのインデックス）
+            has_dot (bool, optional): 継続ダメージを持つ武器の攻撃を入れるかどうか. デフォルトはFalse
+            capacity (int, optional): 配列の初期容量. デフォルトは32
+        """
+        self.weapons = weapons
+        # 継続ダメージの判定は、継続ダメージを持つ武器のプールだけで行う
+        self.has_dot = has_dot
+        # 有効な攻撃は各配列の先頭 count 件
+        self.count = 0
+        self.capacity = capacity
+        for name, dtype in self.FIELDS:
+            setattr(self, name, np.zeros(capacity, dtype=dtype))
+        # 継続ダメージのタイミングになった攻撃のインデックス（update で先頭 dot_hit_count 件を書き込む）
+        self.dot_hits = np.zeros(capacity, dtype=np.intp)
+        self.dot_hit_count = 0
 
+    def __len__(self) -> int:
+        """攻撃の数を取得."""
+        return self.count
 
-class Attack:
-    """攻撃クラス."""
+    def _grow(self) -> None:
+        """配列の容量を2倍に拡張."""
+        self.capacity *= 2
+        for name, _ in self.FIELDS:
+            setattr(self, name, np.resize(getattr(self, name), self.capacity))
+        self.dot_hits = np.resize(self.dot_hits, self.capacity)
 
-    def __init__(self, x: float, y: float, weapon: Weapon, direction: Tuple[float, float]):
-        """攻撃の初期化.
+    def spawn(self, x: float, y: float, weapon_id: int, direction: Tuple[float, float], frame: int) -> None:
+        """攻撃を追加.
 
         Args:
             x (float): 攻撃の開始X座標
             y (float): 攻撃の開始Y座標
-            weapon (Weapon): 使用する武器
+            weapon_id (int): 使用する武器の weapons 内のインデックス
             direction (Tuple[float, float]): 攻撃の方向（正規化されたベクトル）
+            frame (int): 現在のフレーム
         """
-        self.x = x
-        self.y = y
-        self.weapon = weapon
+        if self.count >= self.capacity:
+            self._grow()
+        i = self.count
+        weapon = self.weapons[weapon_id]
         # 武器の種類に応じて攻撃の挙動を設定
-        if weapon.type == "knife":
-            self.lifetime = 30
-            self.dx = direction[0] * 2
-            self.dy = direction[1] * 2
-        elif weapon.type == "magic_blade":
-            self.lifetime = 45  # 持続時間が長い
-            self.dx = direction[0] * 3  # 移動速度が速い
-            self.dy = direction[1] * 3
-        elif weapon.type == "holy_water":
-            self.lifetime = 30
-            self.dx = 0
-            self.dy = 0
-        else:  # sacred_flame
-            self.lifetime = 90  # 長時間持続
-            self.dx = 0
-            self.dy = 0
-            self.dot_timer = 0  # 継続ダメージのタイマー
-
-    def update(self) -> bool:
-        """攻撃の状態を更新.
+        lifetime, speed = _ATTACK_TEMPLATES[weapon.type]
+        self.xs[i] = x
+        self.ys[i] = y
+        self.dxs[i] = direction[0] * speed
+        self.dys[i] = direction[1] * speed
+        self.lifetimes[i] = lifetime
+        self.weapon_ids[i] = weapon_id
+        self.spawn_frames[i] = frame
+        self.count += 1
 
-        Returns:
-            bool: 継続ダメージのタイミングの場合はTrue
+    def spawn_volley(self, x: float, y: float, weapon_id: int, direction: Tuple[float, float], count: int, frame: int) -> None:
+        """同じ武器・同じ方向の攻撃をまとめて追加.
+
+        移動量は最初に1回だけ計算し、追加する攻撃の全てに書き込む.
+
+        Args:
+            x (float): 攻撃の開始X座標
+            y (float): 攻撃の開始Y座標
+            weapon_id (int): 使用する武器の weapons 内のインデックス
+            direction (Tuple[float, float]): 攻撃の方向（正規化されたベクトル）
+            count (int): 追加する攻撃の数
+            frame (int): 現在のフレーム
         """
-        self.lifetime -= 1
-        if self.weapon.type in ["knife", "magic_blade"]:
-            self.x += self.dx
-            self.y += self.dy
-        elif self.weapon.type == "sacred_flame":
-            # 継続ダメージの処理
-            self.dot_timer += 1
-            if self.dot_timer >= 15:  # 15フレームごとにダメージ
-                self.dot_timer = 0
-                return True  # 継続ダメージのタイミング
-        return False
-
-    def is_alive(self) -> bool:
-        """攻撃が有効かどうかを判定.
+        while self.count + count > self.capacity:
+            self._grow()
+        i = self.count
+        j = i + count
+        weapon = self.weapons[weapon_id]
+        # 武器の種類に応じて攻撃の挙動を設定
+        lifetime, speed = _ATTACK_TEMPLATES[weapon.type]
+        self.xs[i:j] = x
+        self.ys[i:j] = y
+        self.dxs[i:j] = direction[0] * speed
+        self.dys[i:j] = direction[1] * speed
+        self.lifetimes[i:j] = lifetime
+        self.weapon_ids[i:j] = weapon_id
+        self.spawn_frames[i:j] = frame
+        self.count = j
 
-        Returns:
-            bool: 攻撃が有効な場合はTrue
+    def update(self, frame: int) -> None:
+        """持続時間が切れた攻撃を取り除き、残りの攻撃をまとめて更新.
+
+        継続ダメージのタイミングになった攻撃のインデックスは dot_hits の先頭
+        dot_hit_count 件に書き込む.
+
+        Args:
+            frame (int): 現在のフレーム
         """
-        return self.lifetime > 0
-
-    def draw(self) -> None:
-        """攻撃を描画."""
-        if self.weapon.type == "knife":
-            # ナイフを青色(12)の小さな四角形で描画
-            pyxel.rect(self.x, self.y, 4, 4, 12)
-        elif self.weapon.type == "magic_blade":
-            # 魔法の剣を水色(6)の大きな四角形で描画
-            pyxel.rect(self.x, self.y, 6, 6, 6)
-            # 軌跡エフェクト
-            for i in range(3):
-                offset = (i + 1) * 2
-                pyxel.rect(self.x - self.dx * offset, self.y - self.dy * offset, 4, 4, 6)
-        elif self.weapon.type == "holy_water":
-            # 聖水を水色(6)の大きな円で描画
-            radius = self.weapon.range // 2
-            pyxel.circb(self.x, self.y, radius, 6)
-        else:  # sacred_flame
-            # 聖なる炎を赤色(8)の円で描画
-            radius = self.weapon.range // 2
-            pyxel.circb(self.x, self.y, radius, 8)
-            # 炎エフェクト
-            inner_radius = radius * 2 // 3
-            pyxel.circb(self.x, self.y, inner_radius, 8)
-            if self.lifetime % 4 < 2:  # 点滅効果
-                pyxel.circb(self.x, self.y, radius - 2, 8)
+        n = self.count
+        self.count, self.dot_hit_count = tick_attacks(
+            self.xs[:n],
+            self.ys[:n],
+            self.dxs[:n],
+            self.dys[:n],
+            self.lifetimes[:n],
+            self.weapon_ids[:n],
+            self.spawn_frames[:n],
+            self.dot_hits,
+            frame,
+            self.has_dot,
+        )
+
+
+def _draw_knives(attacks: AttackPool) -> None:
+    """ナイフの攻撃を青色(12)の小さな四角形で描画.
+
+    Args:
+        attacks (AttackPool): ナイフの攻撃だけを保持するプール
+    """
+    n = attacks.count
+    rect = pyxel.rect
+    for x, y in zip(attacks.xs[:n].tolist(), attacks.ys[:n].tolist()):
+        rect(x, y, 4, 4, 12)
+
+
+def _draw_magic_blades(attacks: AttackPool) -> None:
+    """魔法の剣の攻撃を水色(6)の大きな四角形と軌跡エフェクトで描画.
+
+    Args:
+        attacks (AttackPool): 魔法の剣の攻撃だけを保持するプール
+    """
+    n = attacks.count
+    rect = pyxel.rect
+    for x, y, dx, dy in zip(
+        attacks.xs[:n].tolist(), attacks.ys[:n].tolist(), attacks.dxs[:n].tolist(), attacks.dys[:n].tolist()
+    ):
+        # 軌跡は移動量の2, 4, 6フレーム分うしろに描く
+        dx2 = dx * 2
+        dy2 = dy * 2
+        dx4 = dx2 + dx2
+        dy4 = dy2 + dy2
+        rect(x, y, 6, 6, 6)
+        rect(x - dx2, y - dy2, 4, 4, 6)
+        rect(x - dx4, y - dy4, 4, 4, 6)
+        rect(x - dx4 - dx2, y - dy4 - dy2, 4, 4, 6)
+
+
+def _draw_holy_water(attacks: AttackPool) -> None:
+    """聖水の攻撃を水色(6)の大きな円で描画.
+
+    Args:
+        attacks (AttackPool): 聖水の攻撃だけを保持するプール
+    """
+    n = attacks.count
+    circb = pyxel.circb
+    weapons = attacks.weapons
+    for x, y, weapon_id in zip(attacks.xs[:n].tolist(), attacks.ys[:n].tolist(), attacks.weapon_ids[:n].tolist()):
+        circb(x, y, weapons[weapon_id].draw_radius, 6)
+
+
+def _draw_sacred_flames(attacks: AttackPool) -> None:
+    """聖なる炎の攻撃を赤色(8)の円と炎エフェクトで描画.
+
+    Args:
+        attacks (AttackPool): 聖なる炎の攻撃だけを保持するプール
+    """
+    n = attacks.count
+    circb = pyxel.circb
+    weapons = attacks.weapons
+    for x, y, weapon_id, lifetime in zip(
+        attacks.xs[:n].tolist(),
+        attacks.ys[:n].tolist(),
+        attacks.weapon_ids[:n].tolist(),
+        attacks.lifetimes[:n].tolist(),
+    ):
+        weapon = weapons[weapon_id]
+        circb(x, y, weapon.draw_radius, 8)
+        circb(x, y, weapon.draw_inner_radius, 8)
+        if not lifetime & 2:  # 点滅効果（持続時間を4で割った余りが0か1の時に表示）
+            circb(x, y, weapon.blink_radius, 8)
+
+
+# 武器の種類のコードごとの描画関数
+_DRAW_BY_TYPE = (_draw_knives, _draw_magic_blades, _draw_holy_water, _draw_sacred_flames)
+
+
+def draw_all(attack_pools: Sequence[AttackPool]) -> None:
+    """全ての攻撃を武器の種類ごとにまとめて描画.
+
+    Args:
+        attack_pools (Sequence[AttackPool]): 武器の種類のコードごとの攻撃プール
+    """
+    for type_id, attacks in enumerate(attack_pools):
+        if attacks.count:
+            _DRAW_BY_TYPE[type_id](attacks)
@@ -0,0 +1,55 @@
+"""_enemy_kernels / _attack_kernels のテストで共通して使う補助関数."""
+
+from typing import Callable, Dict, Iterable, List
+
+import numpy as np
+import pytest
+
+
+def kernel_params(loop: Callable, numpy_kernel: Callable, compiled_kernel: Callable, has_numba: bool) -> List:
+    """カーネルの3つの実装を pytest のパラメータとして並べる.
+
+    ループ版は Numba を通さずに Python のまま実行する. コンパイル版は Numba が無い環境では
+    NumPy 版と同じ関数になるのでスキップする.
+
+    Args:
+        loop (Callable): ループ版
+        numpy_kernel (Callable): NumPy 版
+        compiled_kernel (Callable): 実際にゲームで使う版（Numba でコンパイルしたループ版）
+        has_numba (bool): Numba が使えるかどうか
+
+    Returns:
+        List: pytest.param のリスト
+    """
+    return [
+        pytest.param(loop, id="loop"),
+        pytest.param(numpy_kernel, id="numpy"),
+        pytest.param(compiled_kernel, id="numba", marks=pytest.mark.skipif(not has_numba, reason="Numba が無い")),
+    ]
+
+
+def copy_state(arrays: Dict[str, np.ndarray]) -> Dict[str, np.ndarray]:
+    """カーネルに渡す配列をコピー.
+
+    Args:
+        arrays (Dict[str, np.ndarray]): 配列名から配列への辞書
+
+    Returns:
+        Dict[str, np.ndarray]: コピーした配列の辞書
+    """
+    return {name: array.copy() for name, array in arrays.items()}
+
+
+def assert_state_equal(
+    actual: Dict[str, np.ndarray], expected: Dict[str, np.ndarray], names: Iterable[str], atol: float = 0.0
+) -> None:
+    """配列ごとに結果が一致することを確認.
+
+    Args:
+        actual (Dict[str, np.ndarray]): 確認する結果
+        expected (Dict[str, np.ndarray]): 期待する結果
+        names (Iterable[str]): 比較する配列名
+        atol (float, optional): 許容する誤差. デフォルトは0（完全一致）
+    """
+    for name in names:
+        np.testing.assert_allclose(actual[name], expected[name], rtol=0, atol=atol, err_msg=name)
@@ -0,0 +1,99 @@
+"""_attack_kernels モジュールのテスト.
+
+ループ版（_tick_attacks_loop）を基準に、NumPy 版（_tick_attacks_numpy）と
+Numba でコンパイルした版（tick_attacks）が同じ入力に対して同じ結果になることを確認する.
+"""
+
+import numpy as np
+import pytest
+
+from src._attack_kernels import DOT_INTERVAL, HAS_NUMBA, _tick_attacks_loop, _tick_attacks_numpy, tick_attacks
+
+from .kernel_helpers import assert_state_equal, copy_state, kernel_params
+
+# 比較する配列（_tick_attacks_loop の引数の順）
+ARRAY_NAMES = ("xs", "ys", "dxs", "dys", "lifetimes", "weapon_ids", "spawn_frames")
+
+# ループ版・NumPy 版・コンパイル版
+KERNELS = kernel_params(_tick_attacks_loop, _tick_attacks_numpy, tick_attacks, HAS_NUMBA)
+
+
+def make_attacks(seed: int, n: int = 200) -> dict:
+    """持続時間が切れたものを含む攻撃の配列を作成.
+
+    Args:
+        seed (int): 乱数のシード
+        n (int, optional): 攻撃の数. デフォルトは200
+
+    Returns:
+        dict: 配列名から配列への辞書
+    """
+    rng = np.random.default_rng(seed)
+    moving = rng.random(n) < 0.5
+    return {
+        "xs": rng.uniform(0, 160, n).astype(np.float32),
+        "ys": rng.uniform(0, 120, n).astype(np.float32),
+        "dxs": np.where(moving, rng.uniform(-3, 3, n), 0).astype(np.float32),
+        "dys": np.where(moving, rng.uniform(-3, 3, n), 0).astype(np.float32),
+        # 約3割は持続時間が切れている
+        "lifetimes": rng.integers(-2, 90, n).astype(np.int16),
+        "weapon_ids": rng.integers(0, 4, n).astype(np.int8),
+        "spawn_frames": rng.integers(0, 100, n).astype(np.int32),
+    }
+
+
+def run(kernel, arrays: dict, frames: int, has_dot: bool) -> tuple:
+    """配列のコピーに kernel を frames 回適用.
+
+    Args:
+        kernel: 攻撃の更新処理の実装
+        arrays (dict): 入力の配列
+        frames (int): 更新する回数
+        has_dot (bool): 継続ダメージの判定を行うかどうか
+
+    Returns:
+        tuple: (最後の更新後の有効な部分の配列, フレームごとの継続ダメージのインデックスのリスト)
+    """
+    state = copy_state(arrays)
+    n = len(state["xs"])
+    dot_hits = np.zeros(n, dtype=np.intp)
+    hits = []
+    for frame in range(100, 100 + frames):
+        n, hit_count = kernel(*(state[name][:n] for name in ARRAY_NAMES), dot_hits, frame, has_dot)
+        hits.append(dot_hits[:hit_count].tolist())
+    return {name: state[name][:n] for name in ARRAY_NAMES}, hits
+
+
+@pytest.mark.parametrize("kernel", KERNELS[1:])
+@pytest.mark.parametrize("seed", [0, 1, 2])
+@pytest.mark.parametrize("has_dot", [False, True])
+def test_kernels_agree_with_loop(kernel, seed: int, has_dot: bool) -> None:
+    """NumPy 版・コンパイル版の結果がループ版と一致する."""
+    arrays = make_attacks(seed)
+    expected, expected_hits = run(_tick_attacks_loop, arrays, 40, has_dot)
+    actual, actual_hits = run(kernel, arrays, 40, has_dot)
+    assert_state_equal(actual, expected, ARRAY_NAMES if has_dot else ARRAY_NAMES[:-1])
+    assert actual_hits == expected_hits
+
+
+@pytest.mark.parametrize("kernel", KERNELS)
+def test_expired_attacks_are_removed(kernel) -> None:
+    """持続時間が切れた攻撃は取り除かれ、残りは順番を保って前に詰められる."""
+    arrays = make_attacks(0, n=5)
+    arrays["lifetimes"][:] = [0, 3, -1, 1, 5]
+    state, _ = run(kernel, arrays, 1, False)
+    np.testing.assert_array_equal(state["lifetimes"], [2, 0, 4])
+    np.testing.assert_array_equal(state["xs"], arrays["xs"][[1, 3, 4]] + arrays["dxs"][[1, 3, 4]])
+
+
+@pytest.mark.parametrize("kernel", KERNELS)
+def test_dot_ticks_every_interval(kernel) -> None:
+    """継続ダメージは出現してから DOT_INTERVAL 回目の更新ごとに発生し、has_dot が False なら発生しない."""
+    arrays = make_attacks(0, n=1)
+    arrays["lifetimes"][:] = 90
+    arrays["spawn_frames"][:] = 100
+    _, hits = run(kernel, arrays, 90, True)
+    ticks = [update + 1 for update, frame_hits in enumerate(hits) if frame_hits]
+    assert ticks == list(range(DOT_INTERVAL, 91, DOT_INTERVAL))
+    _, hits = run(kernel, arrays, 90, False)
+    assert not any(hits)
@@ -0,0 +1,137 @@
+"""_enemy_kernels モジュールのテスト.
+
+ループ版（_update_enemies_loop）を基準に、NumPy 版（_update_enemies_numpy）と
+Numba でコンパイルした版（update_enemies）が同じ入力に対して同じ結果になることを確認する.
+"""
+
+import numpy as np
+import pytest
+
+from src._enemy_kernels import (
+    CHASE,
+    CIRCLE,
+    FAR_DISTANCE,
+    HAS_NUMBA,
+    TELEPORT,
+    ZIGZAG,
+    _update_enemies_loop,
+    _update_enemies_numpy,
+    update_enemies,
+)
+
+from .kernel_helpers import assert_state_equal, copy_state, kernel_params
+
+PLAYER_X = 80.0
+PLAYER_Y = 60.0
+
+# ループ版・NumPy 版・コンパイル版
+KERNELS = kernel_params(_update_enemies_loop, _update_enemies_numpy, update_enemies, HAS_NUMBA)
+
+# 比較する配列（_update_enemies_loop の引数の順）
+ARRAY_NAMES = (
+    "xs",
+    "ys",
+    "behavior",
+    "speed",
+    "circle_angle",
+    "circle_radius",
+    "circle_speed",
+    "teleport_timer",
+    "teleport_cd",
+    "zigzag_offset",
+    "zigzag_width",
+    "zigzag_speed",
+    "rand_u1",
+    "rand_u2",
+)
+
+
+def make_enemies(seed: int, n: int = 400) -> dict:
+    """行動パターン・距離がばらばらな敵の配列を作成.
+
+    Args:
+        seed (int): 乱数のシード
+        n (int, optional): 敵の数. デフォルトは400
+
+    Returns:
+        dict: 配列名から配列への辞書
+    """
+    rng = np.random.default_rng(seed)
+    xs = rng.uniform(-100, 260, n).astype(np.float32)
+    ys = rng.uniform(-100, 220, n).astype(np.float32)
+    # 遠くにいる敵
+    far = rng.random(n) < 0.2
+    xs[far] = PLAYER_X + rng.choice([-1, 1], far.sum()) * rng.uniform(FAR_DISTANCE + 1, FAR_DISTANCE * 2, far.sum())
+    # プレイヤーと同じ位置にいる敵（距離0）
+    same = rng.random(n) < 0.1
+    xs[same] = PLAYER_X
+    ys[same] = PLAYER_Y
+    cd = np.full(n, 60, dtype=np.int32)
+    return {
+        "xs": xs,
+        "ys": ys,
+        "behavior": rng.choice([CHASE, CIRCLE, TELEPORT, ZIGZAG], n).astype(np.int8),
+        "speed": rng.uniform(0.2, 1.0, n).astype(np.float32),
+        "circle_angle": rng.uniform(0, 2 * np.pi, n).astype(np.float32),
+        "circle_radius": np.full(n, 20, dtype=np.float32),
+        "circle_speed": np.full(n, 0.1, dtype=np.float32),
+        # 半分程度の敵はこのフレームでテレポートする
+        "teleport_timer": rng.choice([0, 30, 59], n).astype(np.int32),
+        "teleport_cd": cd,
+        "zigzag_offset": rng.uniform(0, 2 * np.pi, n).astype(np.float32),
+        "zigzag_width": np.full(n, 30, dtype=np.float32),
+        "zigzag_speed": np.full(n, 0.05, dtype=np.float32),
+        "rand_u1": rng.random(n),
+        "rand_u2": rng.random(n),
+    }
+
+
+def run(kernel, arrays: dict, frames: int) -> dict:
+    """配列のコピーに kernel を frames 回適用.
+
+    Args:
+        kernel: 敵の更新処理の実装
+        arrays (dict): 入力の配列
+        frames (int): 更新する回数
+
+    Returns:
+        dict: 更新後の配列
+    """
+    state = copy_state(arrays)
+    for _ in range(frames):
+        kernel(*(state[name] for name in ARRAY_NAMES), PLAYER_X, PLAYER_Y)
+    return state
+
+
+@pytest.mark.parametrize("kernel", KERNELS[1:])
+@pytest.mark.parametrize("seed", [0, 1, 2])
+@pytest.mark.parametrize("frames", [1, 5])
+def test_kernels_agree_with_loop(kernel, seed: int, frames: int) -> None:
+    """NumPy 版・コンパイル版の結果がループ版と一致する."""
+    arrays = make_enemies(seed)
+    assert_state_equal(run(kernel, arrays, frames), run(_update_enemies_loop, arrays, frames), ARRAY_NAMES, atol=1e-3)
+
+
+@pytest.mark.parametrize("kernel", KERNELS)
+def test_far_enemy_chases_player(kernel) -> None:
+    """遠くにいる敵は行動パターンに関わらずプレイヤーへ直進する."""
+    arrays = make_enemies(0, n=4)
+    arrays["xs"][:] = PLAYER_X + FAR_DISTANCE * 2
+    arrays["ys"][:] = PLAYER_Y
+    arrays["behavior"][:] = [CHASE, CIRCLE, TELEPORT, ZIGZAG]
+    state = run(kernel, arrays, 1)
+    np.testing.assert_allclose(state["xs"], arrays["xs"] - arrays["speed"], atol=1e-4)
+    np.testing.assert_array_equal(state["ys"], arrays["ys"])
+
+
+@pytest.mark.parametrize("kernel", KERNELS)
+def test_zero_distance_enemy_does_not_move(kernel) -> None:
+    """プレイヤーと同じ位置にいる追跡する敵は動かない（0除算しない）."""
+    arrays = make_enemies(0, n=2)
+    arrays["xs"][:] = PLAYER_X
+    arrays["ys"][:] = PLAYER_Y
+    arrays["behavior"][:] = [CHASE, ZIGZAG]
+    state = run(kernel, arrays, 1)
+    assert np.all(np.isfinite(state["xs"]))
+    np.testing.assert_array_equal(state["xs"], arrays["xs"])
+    np.testing.assert_array_equal(state["ys"], arrays["ys"])
@@ -0,0 +1,29 @@
+"""enemy モジュールのテスト."""
+
+import random
+
+from src.enemy import ENEMY_TYPES, EnemyGroup
+from src.game import BaseGame
+
+
+def test_apply_damage_matches_check_collision() -> None:
+    """EnemyGroup.apply_damage が check_collision で重なる敵だけにダメージを与える."""
+    rng = random.Random(0)
+    # check_collision は状態を使わないので、初期化せずにインスタンスを作る
+    game = BaseGame.__new__(BaseGame)
+    for _ in range(20):
+        group = EnemyGroup()
+        for _ in range(rng.randrange(1, 300)):
+            group.spawn(rng.uniform(-40, 200), rng.uniform(-40, 160), rng.choice(ENEMY_TYPES))
+        n = len(group)
+        # 矩形ごとに異なる2のべき乗のダメージを与え、どの矩形に当たったかを合計から読み取る
+        rects = [(rng.uniform(-50, 210), rng.uniform(-50, 170), rng.choice([4, 12, 16, 24, 40])) for _ in range(30)]
+        expected = group.hp[:n].tolist()
+        for bit, (x, y, size) in enumerate(rects):
+            for i in range(n):
+                if game.check_collision(x, y, size, size, float(group.xs[i]), float(group.ys[i]), 8, 8):
+                    expected[i] -= 1 << bit
+        group.apply_damage(
+            [x for x, _, _ in rects], [y for _, y, _ in rects], [size for _, _, size in rects], [1 << bit for bit in range(30)]
+        )
+        assert group.hp[:n].tolist() == expected
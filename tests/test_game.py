@@ -0,0 +1,31 @@
+"""game モジュールのテスト."""
+
+from src.enemy import EnemyGroup
+from src.game import BaseGame
+from src.player import Player
+from src.weapon import WEAPON_TYPE_CODES
+
+
+def test_sacred_flame_dot_ticks_every_16_frames() -> None:
+    """聖なる炎は範囲内に留まる敵に16フレームごとに dot_damage を与える."""
+    # apply_attacks はプレイヤーと敵しか使わないので、初期化せずにインスタンスを作る
+    game = BaseGame.__new__(BaseGame)
+    game.player = Player(80, 60)
+    game.enemies = EnemyGroup()
+    game.player.add_weapon("sacred_flame")
+    weapon_id = len(game.player.weapons) - 1
+    weapon = game.player.weapons[weapon_id]
+    # 継続ダメージだけを見るため、出現時のダメージは0にする
+    weapon.damage = 0
+    game.enemies.spawn(80, 60)
+    game.enemies.hp[0] = 1000
+    attacks = game.player.attack_pools[WEAPON_TYPE_CODES["sacred_flame"]]
+    attacks.spawn(80, 60, weapon_id, (1.0, 0.0), 0)
+    hp = []
+    for frame in range(40):
+        attacks.update(frame)
+        game.apply_attacks()
+        hp.append(int(game.enemies.hp[0]))
+    damaged = [frame for frame in range(1, 40) if hp[frame] < hp[frame - 1]]
+    assert damaged == [15, 31]
+    assert hp[0] - hp[-1] == 2 * weapon.dot_damage